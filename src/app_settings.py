@@ -12,7 +12,11 @@ class AppSettings:
             "symlink_output_dir": "/obsidian/pdfs/",
             "subdir_name": "book_covers",
             "use_table": True,
-            "show_title": False
+            "show_title": False,
+            "output_profiles": [],
+            "network_io_mode": False,
+            "io_concurrency": 4,
+            "run_history": []
         }
         self.load_settings()
     
@@ -45,6 +49,21 @@ class AppSettings:
         self.settings[key] = value
         self.save_settings()
     
+    def get_output_profiles(self):
+        """出力プロファイル（Vaultごとの出力先）の一覧を取得する"""
+        profiles = []
+        for index, profile in enumerate(self.settings.get("output_profiles") or []):
+            if not profile.get("image_output_dir") or not profile.get("symlink_output_dir"):
+                continue
+            profiles.append({
+                "name": profile.get("name") or f"プロファイル{index + 1}",
+                "image_output_dir": profile["image_output_dir"],
+                "symlink_output_dir": profile["symlink_output_dir"],
+                "subdir_name": profile.get("subdir_name") or self.settings.get("subdir_name") or "book_covers",
+                "markdown_path": profile.get("markdown_path") or ""
+            })
+        return profiles
+    
     def reset_settings(self):
         """設定をデフォルトに戻す"""
         self.settings = {
@@ -53,6 +72,10 @@ class AppSettings:
             "symlink_output_dir": "/obsidian/pdfs/",
             "subdir_name": "book_covers",
             "use_table": True,
-            "show_title": False
+            "show_title": False,
+            "output_profiles": [],
+            "network_io_mode": False,
+            "io_concurrency": 4,
+            "run_history": []
         }
         self.save_settings()
\ No newline at end of file
@@ -0,0 +1,111 @@
+import os
+import shutil
+import subprocess
+import sys
+
+class CoverPublisher:
+    """レンダリング済みの表紙画像を複数の出力先に配置するクラス"""
+
+    # Linuxのioctl FICLONE（コピーオンライトのクローン作成）
+    FICLONE = 0x40049409
+
+    def __init__(self, logger=None, dir_cache=None):
+        self.logger = logger
+        # ネットワークI/Oモードで使用するディレクトリキャッシュ（Noneの場合は直接確認）
+        self.dir_cache = dir_cache
+
+    def _exists(self, path):
+        """パスが存在するか確認する"""
+        if self.dir_cache:
+            return self.dir_cache.exists(path)
+        return os.path.exists(path)
+
+    def _getmtime(self, path):
+        """更新日時を返す"""
+        if self.dir_cache:
+            return self.dir_cache.getmtime(path)
+        return os.path.getmtime(path)
+
+    def _makedirs(self, path):
+        """ディレクトリがなければ作成する（作成した場合はTrue）"""
+        if self.dir_cache:
+            return self.dir_cache.makedirs(path)
+        if os.path.exists(path):
+            return False
+        os.makedirs(path)
+        return True
+
+    def publish(self, source_path, output_dir, subdir_name="book_covers"):
+        """表紙画像をハードリンク・リフリンク・コピーの順に試して配置する"""
+        try:
+            # サブディレクトリ作成
+            subdir_path = os.path.join(output_dir, subdir_name)
+            if self._makedirs(subdir_path):
+                if self.logger:
+                    self.logger.log(f"表紙画像用サブディレクトリを作成しました: {subdir_path}")
+
+            output_path = os.path.join(subdir_path, os.path.basename(source_path))
+
+            # 既存ファイルチェック（ハードリンク済みまたは新しい画像があればそのまま使う）
+            if self._exists(output_path):
+                if self._getmtime(output_path) >= self._getmtime(source_path):
+                    if self.logger:
+                        self.logger.log(f"画像すでに存在します: {output_path}")
+                    return output_path
+                os.unlink(output_path)
+                if self.dir_cache:
+                    self.dir_cache.discard(output_path)
+
+            method = self._place(source_path, output_path)
+            if self.dir_cache:
+                self.dir_cache.add(output_path)
+
+            if self.logger:
+                self.logger.log(f"表紙画像を配置しました（{method}）: {output_path}")
+
+            return output_path
+        except Exception as e:
+            if self.logger:
+                self.logger.log(f"エラー: 表紙画像の配置に失敗しました: {str(e)}")
+            return None
+
+    def _place(self, source_path, output_path):
+        """ファイルを配置し、使用した方法を返す"""
+        # 同一ファイルシステムならハードリンク
+        try:
+            os.link(source_path, output_path)
+            return "ハードリンク"
+        except OSError:
+            pass
+
+        # 対応ファイルシステムならリフリンク
+        if self._reflink(source_path, output_path):
+            return "リフリンク"
+
+        # どちらも使えない場合はコピー
+        shutil.copy2(source_path, output_path)
+        return "コピー"
+
+    def _reflink(self, source_path, output_path):
+        """コピーオンライトのクローンを作成する（成功した場合はTrue）"""
+        if sys.platform == "darwin":
+            # APFSではcp -cがclonefile(2)を使用する
+            try:
+                result = subprocess.run(["cp", "-c", source_path, output_path], capture_output=True)
+                return result.returncode == 0
+            except OSError:
+                return False
+
+        if sys.platform.startswith("linux"):
+            try:
+                import fcntl
+                with open(source_path, "rb") as src, open(output_path, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), self.FICLONE, src.fileno())
+                return True
+            except (ImportError, OSError):
+                # 作りかけのファイルを残さない
+                if os.path.exists(output_path):
+                    os.unlink(output_path)
+                return False
+
+        return False
\ No newline at end of file
@@ -2,11 +2,15 @@ import os
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox, scrolledtext
 import threading
+import time
 import re
 
 from src.pdf_processor import PDFProcessor
 from src.symbolic_link_creator import SymbolicLinkCreator
 from src.markdown_generator import MarkdownGenerator
+from src.cover_publisher import CoverPublisher
+from src.network_io import DirectoryCache, PDFPrefetcher
+from src.run_planner import RunPlanner
 from src.app_settings import AppSettings
 from src.logger import Logger
 
@@ -31,6 +35,8 @@ class MainApplication(tk.Tk):
         self.subdir_var = tk.StringVar(value=self.settings.get_setting("subdir_name") or "book_covers")
         self.use_table_var = tk.BooleanVar(value=self.settings.get_setting("use_table"))
         self.show_title_var = tk.BooleanVar(value=self.settings.get_setting("show_title"))
+        self.network_io_var = tk.BooleanVar(value=self.settings.get_setting("network_io_mode"))
+        self.io_concurrency_var = tk.IntVar(value=self.settings.get_setting("io_concurrency") or 4)
         
         # UIの構築
         self.create_ui()
@@ -40,6 +46,7 @@ class MainApplication(tk.Tk):
         self.pdf_processor = PDFProcessor(self.logger)
         self.symlink_creator = SymbolicLinkCreator(self.logger)
         self.markdown_generator = MarkdownGenerator(self.logger)
+        self.cover_publisher = CoverPublisher(self.logger)
     
     def create_ui(self):
         """UIを構築する"""
@@ -97,6 +104,20 @@ class MainApplication(tk.Tk):
         ttk.Checkbutton(options_frame, text="タイトルを表示する", variable=self.show_title_var, 
                         command=self.update_preview).pack(anchor=tk.W)
         
+        # ネットワークドライブ（NFS/SMB）向けI/Oモード
+        network_io_frame = ttk.Frame(options_frame)
+        network_io_frame.pack(fill=tk.X)
+        
+        ttk.Checkbutton(network_io_frame, text="ネットワークドライブ向けI/Oモード", variable=self.network_io_var,
+                        command=self.save_io_settings).pack(side=tk.LEFT)
+        ttk.Label(network_io_frame, text="I/O同時実行数:").pack(side=tk.LEFT, padx=(10, 0))
+        io_concurrency_spinbox = ttk.Spinbox(network_io_frame, from_=1, to=32, width=4,
+                                             textvariable=self.io_concurrency_var, command=self.save_io_settings)
+        io_concurrency_spinbox.pack(side=tk.LEFT, padx=5)
+        # 直接入力された値も保存する
+        io_concurrency_spinbox.bind("<FocusOut>", lambda event: self.save_io_settings())
+        io_concurrency_spinbox.bind("<Return>", lambda event: self.save_io_settings())
+        
         # プレビューセクション
         preview_frame = ttk.LabelFrame(main_frame, text="プレビュー", padding=5)
         # 高さを制限し、拡張を少なめに設定
@@ -143,6 +164,8 @@ class MainApplication(tk.Tk):
         execute_btn = ttk.Button(button_frame, text="すべて実行", command=self.execute, style="Execute.TButton")
         execute_btn.pack(side=tk.LEFT, padx=5)
         
+        ttk.Button(button_frame, text="全プロファイルに実行", command=self.execute_profiles).pack(side=tk.LEFT, padx=5)
+        
         ttk.Button(button_frame, text="設定リセット", command=self.reset_settings).pack(side=tk.LEFT, padx=5)
         
         # 実行ボタン用の特別なスタイルを定義
@@ -192,6 +215,43 @@ class MainApplication(tk.Tk):
             self.settings.set_setting("symlink_output_dir", directory)
             self.update_preview()
     
+    def save_io_settings(self):
+        """I/Oモードの設定を保存"""
+        self.settings.set_setting("network_io_mode", self.network_io_var.get())
+        self.settings.set_setting("io_concurrency", self._get_io_concurrency())
+    
+    def _get_io_concurrency(self):
+        """I/O同時実行数を取得（不正な値の場合は既定値）"""
+        try:
+            return max(1, int(self.io_concurrency_var.get()))
+        except (tk.TclError, ValueError):
+            return 4
+    
+    def _io_mode(self):
+        """実行記録の区別に使うI/Oモード名を返す"""
+        return "network" if self.network_io_var.get() else "local"
+    
+    def _configure_io(self):
+        """実行ごとにI/Oモードを設定する（ディレクトリ一覧のキャッシュは実行単位で作り直す）"""
+        dir_cache = DirectoryCache() if self.network_io_var.get() else None
+        self.pdf_processor.dir_cache = dir_cache
+        self.symlink_creator.dir_cache = dir_cache
+        self.cover_publisher.dir_cache = dir_cache
+    
+    def _iter_pdf_data(self, pdf_files, image_output_dir, subdir_name):
+        """(PDFパス, 先読みした内容) を入力順に返す（先読みはネットワークI/Oモードでレンダリングが必要なPDFのみ）"""
+        pdf_files = [pdf_file for pdf_file in pdf_files if pdf_file]
+        
+        if not self.network_io_var.get():
+            for pdf_file in pdf_files:
+                yield pdf_file, None
+            return
+        
+        prefetcher = PDFPrefetcher(self._get_io_concurrency(), self.logger)
+        yield from prefetcher.iter_prefetched(
+            pdf_files,
+            lambda pdf_file: self.pdf_processor.needs_render(pdf_file, image_output_dir, subdir_name))
+    
     def update_preview(self):
         """プレビューを更新"""
         # 設定を更新
@@ -201,7 +261,7 @@ class MainApplication(tk.Tk):
         
         # マークダウンプレビューを更新
         markdown = self.markdown_generator.generate_markdown(
-            self.input_files,
+            list(self.input_files),
             self.image_output_var.get(),
             self.symlink_output_var.get(),
             self.use_table_var.get(),
@@ -250,8 +310,38 @@ class MainApplication(tk.Tk):
                 messagebox.showerror("エラー", f"シンボリックリンク作成先ディレクトリの作成に失敗しました: {str(e)}")
                 return
         
-        # 処理を別スレッドで実行
-        threading.Thread(target=self._process_files).start()
+        # 実行計画の作成を別スレッドで実行（PDFは開かない）
+        threading.Thread(target=self._plan_files,
+                         args=(list(self.input_files), image_output_dir, symlink_output_dir, subdir_name)).start()
+    
+    def _plan_files(self, pdf_files, image_output_dir, symlink_output_dir, subdir_name):
+        """実行計画を作成し、確認後に処理を開始する（別スレッド）"""
+        self.logger.log("実行計画を作成しています...")
+        
+        mode = self._io_mode()
+        # 前回の実行のキャッシュを使わないよう、計画専用のキャッシュとPDFProcessorを用意する
+        dir_cache = DirectoryCache() if mode == "network" else None
+        planner = RunPlanner(PDFProcessor(self.logger, dir_cache), self.logger, dir_cache)
+        try:
+            plan = planner.plan(pdf_files, image_output_dir, symlink_output_dir, subdir_name)
+            summary = planner.format_plan(plan, self.settings.get_setting("run_history"), mode)
+        except Exception as e:
+            self.logger.log(f"エラー: 実行計画の作成に失敗しました: {str(e)}")
+            return
+        
+        def confirm():
+            self.logger.log("実行計画:\n" + summary)
+            planner.log_plan(plan)
+            
+            if not messagebox.askyesno("実行計画の確認", summary + "\n\n実行しますか？"):
+                self.logger.log("処理を中止しました。")
+                return
+            
+            # 処理を別スレッドで実行
+            threading.Thread(target=self._process_files, args=(plan,)).start()
+        
+        # 確認ダイアログはメインスレッドで表示
+        self.after(0, confirm)
         
     def execute_image_extraction(self):
         """PDFから画像のみを抽出する"""
@@ -280,12 +370,13 @@ class MainApplication(tk.Tk):
         subdir_name = self.subdir_var.get()
         
         self.logger.log("画像抽出を開始します...")
+        self._configure_io()
         
         # 各PDFファイルを処理
-        for pdf_file in self.input_files:
+        for pdf_file, pdf_data in self._iter_pdf_data(self.input_files, image_output_dir, subdir_name):
             try:
                 # 表紙画像を抽出
-                _, _ = self.pdf_processor.extract_cover_image_with_pymupdf(pdf_file, image_output_dir, subdir_name=subdir_name)
+                _, _ = self.pdf_processor.extract_cover_image_with_pymupdf(pdf_file, image_output_dir, subdir_name=subdir_name, pdf_data=pdf_data)
             except Exception as e:
                 self.logger.log(f"エラー: 画像抽出中にエラーが発生しました: {str(e)}")
         
@@ -323,6 +414,7 @@ class MainApplication(tk.Tk):
         subdir_name = self.subdir_var.get()
         
         self.logger.log("シンボリックリンク作成を開始します...")
+        self._configure_io()
         
         # シンボリックリンク作成記録をクリア
         self.symlink_creator.clear_created_links()
@@ -340,8 +432,7 @@ class MainApplication(tk.Tk):
         
         def update_ui():
             self.symlink_preview.delete(1.0, tk.END)
-            for link in created_links:
-                target = os.readlink(link) if os.path.islink(link) else "不明"
+            for link, target in created_links:
                 self.symlink_preview.insert(tk.END, f"{link} -> {target}\n")
             
             self.logger.log("シンボリックリンク作成が完了しました。")
@@ -350,35 +441,57 @@ class MainApplication(tk.Tk):
         # UIの更新はメインスレッドで実行
         self.after(0, update_ui)
     
-    def _process_files(self):
+    def _process_files(self, plan):
         """ファイル処理を実行（別スレッド）"""
         image_output_dir = self.image_output_var.get()
         symlink_output_dir = self.symlink_output_var.get()
         subdir_name = self.subdir_var.get()
         
         self.logger.log("処理を開始します...")
+        self._configure_io()
         
         # シンボリックリンク作成記録をクリア
         self.symlink_creator.clear_created_links()
         
+        # 次回の見積もり用に実行全体の時間を計測
+        rendered = 0
+        cover_bytes = 0
+        started = time.monotonic()
+        
         # 各PDFファイルを処理
-        for pdf_file in self.input_files:
+        for pdf_file, pdf_data in self._iter_pdf_data([entry["pdf_file"] for entry in plan], image_output_dir, subdir_name):
+            cover_path = None
+            will_render = False
             try:
-                # 表紙画像を抽出
-                _, _ = self.pdf_processor.extract_cover_image_with_pymupdf(pdf_file, image_output_dir, subdir_name=subdir_name)
+                # 表紙画像を抽出（実行時点でレンダリングが必要かを記録する）
+                will_render = self.pdf_processor.needs_render(pdf_file, image_output_dir, subdir_name)
+                cover_path, _ = self.pdf_processor.extract_cover_image_with_pymupdf(pdf_file, image_output_dir, subdir_name=subdir_name, pdf_data=pdf_data)
                 
                 # シンボリックリンクを作成
                 self.symlink_creator.create_symlink(pdf_file, symlink_output_dir, subdir_name=subdir_name)
             except Exception as e:
                 self.logger.log(f"エラー: ファイル処理中にエラーが発生しました: {str(e)}")
+            
+            if will_render and cover_path:
+                try:
+                    cover_bytes += os.path.getsize(cover_path)
+                    rendered += 1
+                except OSError:
+                    pass
+        
+        # 実行記録を保存
+        if plan:
+            run_history = RunPlanner.record_run(
+                self.settings.get_setting("run_history"), self._io_mode(),
+                len(plan), rendered, time.monotonic() - started, cover_bytes)
+            self.settings.set_setting("run_history", run_history)
         
         # シンボリックリンクパス一覧を更新
         created_links = self.symlink_creator.get_created_links()
         
         def update_ui():
             self.symlink_preview.delete(1.0, tk.END)
-            for link in created_links:
-                target = os.readlink(link) if os.path.islink(link) else "不明"
+            for link, target in created_links:
                 self.symlink_preview.insert(tk.END, f"{link} -> {target}\n")
             
             # マークダウンをクリップボードにコピー
@@ -392,6 +505,130 @@ class MainApplication(tk.Tk):
         # UIの更新はメインスレッドで実行
         self.after(0, update_ui)
     
+    def execute_profiles(self):
+        """設定ファイルの出力プロファイルすべてに対して処理を実行"""
+        if not self.input_files:
+            messagebox.showwarning("警告", "処理するPDFファイルが選択されていません。")
+            return
+        
+        profiles = self.settings.get_output_profiles()
+        if not profiles:
+            messagebox.showwarning("警告", "設定ファイルに出力プロファイル（output_profiles）が設定されていません。")
+            return
+        
+        # 各プロファイルの出力ディレクトリが存在するか確認
+        for profile in profiles:
+            for directory in (profile["image_output_dir"], profile["symlink_output_dir"]):
+                if not os.path.exists(directory):
+                    try:
+                        os.makedirs(directory)
+                        self.logger.log(f"ディレクトリを作成しました: {directory}")
+                    except Exception as e:
+                        messagebox.showerror("エラー", f"{profile['name']}の出力先ディレクトリの作成に失敗しました: {str(e)}")
+                        return
+        
+        # 処理を別スレッドで実行
+        threading.Thread(target=self._process_profiles, args=(profiles,)).start()
+    
+    def _unique_input_files(self):
+        """実体が同じPDFを除いた入力ファイルのリストを返す"""
+        unique_files = []
+        seen = set()
+        for pdf_file in self.input_files:
+            if not pdf_file:
+                continue
+            real_path = os.path.realpath(pdf_file)
+            if real_path in seen:
+                continue
+            seen.add(real_path)
+            unique_files.append(pdf_file)
+        return unique_files
+    
+    def _process_profiles(self, profiles):
+        """表紙を一度だけレンダリングし、全プロファイルに配置する（別スレッド）"""
+        pdf_files = self._unique_input_files()
+        primary = profiles[0]
+        
+        self.logger.log(f"{len(profiles)} プロファイルへの処理を開始します...")
+        self._configure_io()
+        
+        # シンボリックリンク作成記録をクリア
+        self.symlink_creator.clear_created_links()
+        
+        # 各PDFファイルを処理（レンダリングは最初のプロファイルに対してのみ行う）
+        for pdf_file, pdf_data in self._iter_pdf_data(pdf_files, primary["image_output_dir"], primary["subdir_name"]):
+            try:
+                # レンダリングは一度だけ行い、保存に失敗した場合のみ次のプロファイルに保存する
+                cover_path = None
+                rendered_profile = None
+                cover_image = None
+                for profile in profiles:
+                    if self.pdf_processor.needs_render(pdf_file, profile["image_output_dir"], profile["subdir_name"]):
+                        if cover_image is None:
+                            cover_image = self.pdf_processor.render_cover_image(pdf_file, pdf_data)
+                            if cover_image is None:
+                                # PDF自体の問題のため他のプロファイルでは試さない
+                                break
+                    cover_path, _ = self.pdf_processor.extract_cover_image_with_pymupdf(
+                        pdf_file, profile["image_output_dir"], subdir_name=profile["subdir_name"], cover_image=cover_image)
+                    if cover_path:
+                        rendered_profile = profile
+                        break
+                
+                for profile in profiles:
+                    # 他のプロファイルにはレンダリング済みの画像を配置
+                    if not cover_path:
+                        self.logger.log(f"警告: {profile['name']}に表紙画像を用意できませんでした: {pdf_file}")
+                    elif profile is not rendered_profile:
+                        if not self.cover_publisher.publish(
+                                cover_path, profile["image_output_dir"], subdir_name=profile["subdir_name"]):
+                            self.logger.log(f"警告: {profile['name']}に表紙画像を配置できませんでした: {pdf_file}")
+                    
+                    # シンボリックリンクはプロファイルごとに作成
+                    self.symlink_creator.create_symlink(
+                        pdf_file, profile["symlink_output_dir"], subdir_name=profile["subdir_name"])
+            except Exception as e:
+                self.logger.log(f"エラー: ファイル処理中にエラーが発生しました: {str(e)}")
+        
+        # プロファイルごとにマークダウンを生成
+        markdowns = []
+        for profile in profiles:
+            markdown = self.markdown_generator.generate_markdown(
+                list(pdf_files),
+                profile["image_output_dir"],
+                profile["symlink_output_dir"],
+                self.use_table_var.get(),
+                self.show_title_var.get(),
+                profile["subdir_name"]
+            )
+            markdowns.append(markdown)
+            
+            if profile["markdown_path"]:
+                try:
+                    with open(profile["markdown_path"], "w", encoding="utf-8") as f:
+                        f.write(markdown + "\n")
+                    self.logger.log(f"マークダウンを保存しました: {profile['markdown_path']}")
+                except Exception as e:
+                    self.logger.log(f"エラー: マークダウンの保存に失敗しました: {str(e)}")
+        
+        # シンボリックリンクパス一覧を更新
+        created_links = self.symlink_creator.get_created_links()
+        
+        def update_ui():
+            self.symlink_preview.delete(1.0, tk.END)
+            for link, target in created_links:
+                self.symlink_preview.insert(tk.END, f"{link} -> {target}\n")
+            
+            # 最初のプロファイルのマークダウンをクリップボードにコピー
+            self.clipboard_clear()
+            self.clipboard_append(markdowns[0])
+            
+            self.logger.log("全プロファイルの処理が完了しました。最初のプロファイルのマークダウンがクリップボードにコピーされました。")
+            messagebox.showinfo("完了", "全プロファイルの処理が完了しました。")
+        
+        # UIの更新はメインスレッドで実行
+        self.after(0, update_ui)
+    
     def reset_settings(self):
         """設定をリセット"""
         if messagebox.askyesno("確認", "設定をデフォルトに戻しますか？"):
@@ -404,6 +641,8 @@ class MainApplication(tk.Tk):
             self.subdir_var.set(self.settings.get_setting("subdir_name") or "book_covers")
             self.use_table_var.set(self.settings.get_setting("use_table"))
             self.show_title_var.set(self.settings.get_setting("show_title"))
+            self.network_io_var.set(self.settings.get_setting("network_io_mode"))
+            self.io_concurrency_var.set(self.settings.get_setting("io_concurrency"))
             
             # 入力ファイルリストをクリア
             self.input_files = []
@@ -0,0 +1,144 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class DirectoryCache:
+    """ディレクトリ一覧をまとめて取得し、存在確認をメモリ上で行うクラス"""
+
+    def __init__(self):
+        # ディレクトリパス -> {エントリ名: エントリ情報}（存在しない場合はNone）
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _record(self, is_symlink=False, entry=None):
+        """エントリ情報を作成する（更新日時とリンク先は必要になった時点で取得する）"""
+        return {"is_symlink": is_symlink, "entry": entry, "mtime": None, "target": None}
+
+    def _list(self, directory):
+        """ディレクトリ一覧を一度だけ取得する"""
+        directory = os.path.normpath(directory)
+        with self._lock:
+            if directory not in self._entries:
+                try:
+                    with os.scandir(directory) as it:
+                        self._entries[directory] = {
+                            entry.name: self._record(entry.is_symlink(), entry) for entry in it
+                        }
+                except (FileNotFoundError, NotADirectoryError):
+                    self._entries[directory] = None
+            return self._entries[directory]
+
+    def _get(self, path):
+        """パスのエントリ情報を返す（存在しない場合はNone）"""
+        parent, name = os.path.split(os.path.normpath(path))
+        entries = self._list(parent)
+        return entries.get(name) if entries else None
+
+    def exists(self, path):
+        """パスが存在するか確認する（リンク切れのシンボリックリンクも存在として扱う）"""
+        return self._get(path) is not None
+
+    def islink(self, path):
+        """パスがシンボリックリンクか確認する"""
+        record = self._get(path)
+        return bool(record and record["is_symlink"])
+
+    def getmtime(self, path):
+        """更新日時を返す（scandirで得たエントリのstat結果を使い、一度だけ取得する）"""
+        record = self._get(path)
+        if record is None:
+            raise FileNotFoundError(path)
+        if record["mtime"] is None:
+            if record["is_symlink"]:
+                # シンボリックリンクはリンク先の更新日時
+                record["mtime"] = os.path.getmtime(path)
+            elif record["entry"] is not None:
+                record["mtime"] = record["entry"].stat(follow_symlinks=False).st_mtime
+            else:
+                record["mtime"] = os.lstat(path).st_mtime
+        return record["mtime"]
+
+    def readlink(self, path):
+        """シンボリックリンクのリンク先を返す（一度だけ取得する）"""
+        record = self._get(path)
+        if record is None or not record["is_symlink"]:
+            raise OSError(f"シンボリックリンクではありません: {path}")
+        if record["target"] is None:
+            record["target"] = os.readlink(path)
+        return record["target"]
+
+    def makedirs(self, path):
+        """ディレクトリがなければ作成する（作成した場合はTrue）"""
+        if self.exists(path):
+            return False
+        os.makedirs(path, exist_ok=True)
+        path = os.path.normpath(path)
+        with self._lock:
+            self._entries[path] = {}
+        self.add(path)
+        return True
+
+    def add(self, path, is_symlink=False, target=None):
+        """作成・更新したエントリを記録する"""
+        parent, name = os.path.split(os.path.normpath(path))
+        with self._lock:
+            entries = self._entries.get(parent)
+            if entries is None:
+                # 親ディレクトリが未取得または作成直後の場合は次回取得し直す
+                self._entries.pop(parent, None)
+            else:
+                entries[name] = self._record(is_symlink)
+                entries[name]["target"] = target
+
+    def discard(self, path):
+        """削除したエントリを記録から外す"""
+        parent, name = os.path.split(os.path.normpath(path))
+        with self._lock:
+            entries = self._entries.get(parent)
+            if entries:
+                entries.pop(name, None)
+
+
+class PDFPrefetcher:
+    """スレッドプールでPDFの内容を先読みするクラス"""
+
+    def __init__(self, max_workers=4, logger=None):
+        self.max_workers = max(1, int(max_workers))
+        self.logger = logger
+
+    def _read(self, pdf_path):
+        """PDFの内容をまとめて読み込む"""
+        with open(pdf_path, "rb") as f:
+            return f.read()
+
+    def iter_prefetched(self, pdf_files, needs_data=None):
+        """(PDFパス, 内容) を入力順に返す（needs_dataがTrueのPDFのみ、max_workers件まで先読み）"""
+        pdf_files = list(pdf_files)
+        targets = [index for index, pdf_file in enumerate(pdf_files)
+                   if needs_data is None or needs_data(pdf_file)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            next_target = 0
+
+            for index, pdf_file in enumerate(pdf_files):
+                # これから必要になるPDFをmax_workers件まで先読みする
+                while next_target < len(targets) and len(futures) < self.max_workers:
+                    target = targets[next_target]
+                    futures[target] = executor.submit(self._read, pdf_files[target])
+                    next_target += 1
+
+                future = futures.pop(index, None)
+                if future is None:
+                    yield pdf_file, None
+                    continue
+
+                try:
+                    data = future.result()
+                except Exception as e:
+                    # 先読みに失敗した場合は通常の読み込みに任せる
+                    if self.logger:
+                        self.logger.log(f"警告: PDFの先読みに失敗しました: {pdf_file}: {str(e)}")
+                    data = None
+
+                yield pdf_file, data
\ No newline at end of file
@@ -7,39 +7,58 @@ from io import BytesIO
 class PDFProcessor:
     """PDFの処理を担当するクラス"""
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, dir_cache=None):
         self.logger = logger
+        # ネットワークI/Oモードで使用するディレクトリキャッシュ（Noneの場合は直接確認）
+        self.dir_cache = dir_cache
     
-    def extract_cover_image_with_pymupdf(self, pdf_path, output_dir, subdir_name="book_covers"):
-        """PyMuPDFを使用してPDFの表紙画像を視覚的に正確に抽出する"""
+    def _exists(self, path):
+        """パスが存在するか確認する"""
+        if self.dir_cache:
+            return self.dir_cache.exists(path)
+        return os.path.exists(path)
+    
+    def _makedirs(self, path):
+        """ディレクトリがなければ作成する（作成した場合はTrue）"""
+        if self.dir_cache:
+            return self.dir_cache.makedirs(path)
+        if os.path.exists(path):
+            return False
+        os.makedirs(path)
+        return True
+    
+    def is_stale(self, pdf_path, output_path):
+        """PDFが表紙画像より新しいか確認する"""
+        try:
+            if self.dir_cache:
+                return self.dir_cache.getmtime(pdf_path) > self.dir_cache.getmtime(output_path)
+            return os.path.getmtime(pdf_path) > os.path.getmtime(output_path)
+        except OSError:
+            return False
+    
+    def get_cover_path(self, pdf_path, output_dir, subdir_name="book_covers"):
+        """PDFに対応する表紙画像の保存先パスを返す"""
+        pdf_name_without_ext = os.path.splitext(os.path.basename(pdf_path))[0]
+        output_filename = re.sub(r'[\s\u3000]+', '_', f"{pdf_name_without_ext}.png")
+        return os.path.join(output_dir, subdir_name, output_filename)
+    
+    def needs_render(self, pdf_path, output_dir, subdir_name="book_covers"):
+        """表紙画像のレンダリングが必要か確認する"""
+        output_path = self.get_cover_path(pdf_path, output_dir, subdir_name)
+        return not self._exists(output_path) or self.is_stale(pdf_path, output_path)
+    
+    def render_cover_image(self, pdf_path, pdf_data=None):
+        """PDFの1ページ目を表紙画像としてレンダリングする（pdf_dataがあればメモリから開く、失敗した場合はNone）"""
         try:
-
-            # ファイル名の処理
-            pdf_filename = os.path.basename(pdf_path)
-            pdf_name_without_ext = os.path.splitext(pdf_filename)[0]
-            output_filename = re.sub(r'[\s\u3000]+', '_', f"{pdf_name_without_ext}.png")
-            
-            # サブディレクトリ作成
-            subdir_path = os.path.join(output_dir, subdir_name)
-            if not os.path.exists(subdir_path):
-                os.makedirs(subdir_path)
-                if self.logger:
-                    self.logger.log(f"表紙画像用サブディレクトリを作成しました: {subdir_path}")
-            
-            output_path = os.path.join(subdir_path, output_filename)
-            
-            # 既存ファイルチェック
-            if os.path.exists(output_path):
-                if self.logger:
-                    self.logger.log(f"画像すでに存在します: {output_path}")
-                return output_path, subdir_name
-            
             # PDFドキュメントを開く
-            doc = fitz.open(pdf_path)
+            if pdf_data is not None:
+                doc = fitz.open(stream=pdf_data, filetype="pdf")
+            else:
+                doc = fitz.open(pdf_path)
             if not doc:
                 if self.logger:
                     self.logger.log(f"エラー: PDFを開けませんでした: {pdf_path}")
-                return None, None
+                return None
             
             # 1ページ目を取得
             page = doc[0]
@@ -53,25 +72,58 @@ class PDFProcessor:
             
             # PILイメージに変換
             img_data = pix.tobytes("png")
-            from io import BytesIO
             img = Image.open(BytesIO(img_data))
             
             # 必要に応じてサイズ調整
             max_size = (600, 800)
             img.thumbnail(max_size, Image.LANCZOS)
             
+            return img
+            
+        except ImportError:
+            if self.logger:
+                self.logger.log("PyMuPDFがインストールされていません。pip install pymupdfを実行してください。")
+            return None
+        except Exception as e:
+            if self.logger:
+                self.logger.log(f"エラー: PDFのレンダリングに失敗しました: {pdf_path}: {str(e)}")
+            return None
+    
+    def extract_cover_image_with_pymupdf(self, pdf_path, output_dir, subdir_name="book_covers", pdf_data=None, cover_image=None):
+        """PyMuPDFを使用してPDFの表紙画像を視覚的に正確に抽出する（cover_imageがあればレンダリングせずに保存する）"""
+        try:
+
+            # サブディレクトリ作成
+            subdir_path = os.path.join(output_dir, subdir_name)
+            if self._makedirs(subdir_path):
+                if self.logger:
+                    self.logger.log(f"表紙画像用サブディレクトリを作成しました: {subdir_path}")
+            
+            output_path = self.get_cover_path(pdf_path, output_dir, subdir_name)
+            
+            # 既存ファイルチェック（PDFが更新されている場合は作り直す）
+            if self._exists(output_path):
+                if not self.is_stale(pdf_path, output_path):
+                    if self.logger:
+                        self.logger.log(f"画像すでに存在します: {output_path}")
+                    return output_path, subdir_name
+                if self.logger:
+                    self.logger.log(f"PDFが更新されているため表紙画像を作り直します: {output_path}")
+            
+            img = cover_image if cover_image is not None else self.render_cover_image(pdf_path, pdf_data)
+            if img is None:
+                return None, None
+            
             # 画像を保存
             img.save(output_path, "PNG")
+            if self.dir_cache:
+                self.dir_cache.add(output_path)
             
             if self.logger:
                 self.logger.log(f"表紙画像を保存しました: {output_path}")
             
             return output_path, subdir_name
             
-        except ImportError:
-            if self.logger:
-                self.logger.log("PyMuPDFがインストールされていません。pip install pymupdfを実行してください。")
-            return None, None
         except Exception as e:
             if self.logger:
                 self.logger.log(f"エラー: {str(e)}")
@@ -0,0 +1,172 @@
+import os
+import re
+
+class RunPlanner:
+    """実行前に処理内容を分類し、過去の実行記録から所要時間を見積もるクラス"""
+
+    NEW = "new"
+    CHANGED = "changed"
+    UP_TO_DATE = "up_to_date"
+    COLLISION = "collision"
+    LINK_RETARGET = "link_retarget"
+
+    LABELS = {
+        NEW: "新規",
+        CHANGED: "更新あり",
+        UP_TO_DATE: "最新",
+        COLLISION: "名前の衝突",
+        LINK_RETARGET: "リンク張り替え",
+    }
+
+    # 表紙画像のレンダリングが発生する分類
+    RENDER_STATUSES = (NEW, CHANGED)
+
+    # 保存する実行記録の件数
+    HISTORY_LIMIT = 10
+
+    def __init__(self, pdf_processor, logger=None, dir_cache=None):
+        self.pdf_processor = pdf_processor
+        self.logger = logger
+        self.dir_cache = dir_cache
+
+    def _exists(self, path):
+        """パスが存在するか確認する（リンク切れのシンボリックリンクも存在として扱う）"""
+        if self.dir_cache:
+            return self.dir_cache.exists(path)
+        return os.path.lexists(path)
+
+    def _readlink(self, path):
+        """シンボリックリンクのリンク先を返す"""
+        if self.dir_cache:
+            return self.dir_cache.readlink(path)
+        return os.readlink(path)
+
+    def _islink(self, path):
+        """パスがシンボリックリンクか確認する"""
+        if self.dir_cache:
+            return self.dir_cache.islink(path)
+        return os.path.islink(path)
+
+    def plan(self, pdf_files, image_output_dir, symlink_output_dir, subdir_name="book_covers"):
+        """PDFを開かずに各入力ファイルの処理内容を分類する"""
+        entries = []
+        claimed = {}
+
+        for pdf_file in pdf_files:
+            if not pdf_file:
+                continue
+
+            cover_path = self.pdf_processor.get_cover_path(pdf_file, image_output_dir, subdir_name)
+            link_name = re.sub(r'[\s\u3000]+', '_', os.path.basename(pdf_file))
+            link_path = os.path.join(symlink_output_dir, subdir_name, link_name)
+
+            # 別のPDFと同じ画像名・リンク名になる場合は衝突
+            source = os.path.abspath(pdf_file)
+            cover_owner = claimed.setdefault(cover_path, source)
+            link_owner = claimed.setdefault(link_path, source)
+            if cover_owner != source or link_owner != source or \
+                    (self._exists(link_path) and not self._islink(link_path)):
+                status = self.COLLISION
+            elif not self._exists(cover_path):
+                status = self.NEW
+            elif self.pdf_processor.is_stale(pdf_file, cover_path):
+                status = self.CHANGED
+            elif not self._exists(link_path) or self._readlink(link_path) != pdf_file:
+                status = self.LINK_RETARGET
+            else:
+                status = self.UP_TO_DATE
+
+            entries.append({
+                "pdf_file": pdf_file,
+                "status": status,
+                "cover_path": cover_path,
+                "link_path": link_path,
+            })
+
+        return entries
+
+    def summarize(self, plan):
+        """分類ごとの件数を返す"""
+        counts = {status: 0 for status in self.LABELS}
+        for entry in plan:
+            counts[entry["status"]] += 1
+        return counts
+
+    def estimate(self, plan, run_history, mode):
+        """同じI/Oモードの過去の実行記録から所要時間（秒）とディスク使用量（バイト）を見積もる"""
+        runs = [run for run in run_history or [] if run.get("mode") == mode]
+        skip_runs = [run for run in runs if not run["rendered"] and run["files"]]
+        render_runs = [run for run in runs if run["rendered"]]
+
+        # レンダリングのない実行から1ファイルあたりの時間を求める
+        skip_rate = None
+        if skip_runs:
+            skip_rate = sum(run["seconds"] for run in skip_runs) / sum(run["files"] for run in skip_runs)
+
+        # レンダリングのある実行からスキップ分を差し引いて1件あたりのレンダリング時間を求める
+        render_rate = None
+        cover_size = None
+        if render_runs:
+            rendered = sum(run["rendered"] for run in render_runs)
+            skipped = sum(run["files"] - run["rendered"] for run in render_runs)
+            seconds = sum(run["seconds"] for run in render_runs) - (skip_rate or 0) * skipped
+            render_rate = max(seconds, 0) / rendered
+            cover_size = sum(run["cover_bytes"] for run in render_runs) / rendered
+
+        counts = self.summarize(plan)
+        render_count = sum(counts[status] for status in self.RENDER_STATUSES)
+        skip_count = len(plan) - render_count
+
+        seconds = None
+        if (render_count == 0 or render_rate is not None) and (skip_rate is not None or render_rate is not None):
+            seconds = render_count * (render_rate or 0) + skip_count * (skip_rate or 0)
+
+        # 表紙画像を作り直しても上書きのため、ディスク使用量は新規分のみ
+        disk_bytes = None
+        if cover_size is not None:
+            disk_bytes = int(counts[self.NEW] * cover_size)
+        elif counts[self.NEW] == 0:
+            disk_bytes = 0
+
+        return seconds, disk_bytes
+
+    def format_plan(self, plan, run_history, mode):
+        """確認用の実行計画の文字列を生成する"""
+        counts = self.summarize(plan)
+        lines = [f"対象: {len(plan)} ファイル"]
+        for status, label in self.LABELS.items():
+            lines.append(f"  {label}: {counts[status]}")
+
+        seconds, disk_bytes = self.estimate(plan, run_history, mode)
+        if seconds is None:
+            lines.append("推定所要時間: 過去の実行記録がないため算出できません")
+        else:
+            minutes, secs = divmod(int(round(seconds)), 60)
+            lines.append(f"推定所要時間: 約{minutes}分{secs}秒")
+        if disk_bytes is None:
+            lines.append("推定ディスク使用量: 過去の実行記録がないため算出できません")
+        else:
+            lines.append(f"推定ディスク使用量: 約{disk_bytes / (1024 * 1024):.1f} MB")
+
+        return "\n".join(lines)
+
+    def log_plan(self, plan):
+        """最新以外のファイルの処理内容をログに出力する"""
+        if not self.logger:
+            return
+        for entry in plan:
+            if entry["status"] != self.UP_TO_DATE:
+                self.logger.log(f"[{self.LABELS[entry['status']]}] {entry['pdf_file']}")
+
+    @classmethod
+    def record_run(cls, run_history, mode, files, rendered, seconds, cover_bytes):
+        """実行全体の結果を記録に追加し、新しい記録のリストを返す"""
+        history = list(run_history or [])
+        history.append({
+            "mode": mode,
+            "files": files,
+            "rendered": rendered,
+            "seconds": round(seconds, 3),
+            "cover_bytes": cover_bytes,
+        })
+        return history[-cls.HISTORY_LIMIT:]
\ No newline at end of file
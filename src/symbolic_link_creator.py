@@ -4,9 +4,32 @@ import re
 class SymbolicLinkCreator:
     """シンボリックリンクの作成を担当するクラス"""
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, dir_cache=None):
         self.logger = logger
         self.created_links = []
+        # ネットワークI/Oモードで使用するディレクトリキャッシュ（Noneの場合は直接確認）
+        self.dir_cache = dir_cache
+    
+    def _exists(self, path):
+        """パスが存在するか確認する（リンク切れのシンボリックリンクも存在として扱う）"""
+        if self.dir_cache:
+            return self.dir_cache.exists(path)
+        return os.path.lexists(path)
+    
+    def _islink(self, path):
+        """パスがシンボリックリンクか確認する"""
+        if self.dir_cache:
+            return self.dir_cache.islink(path)
+        return os.path.islink(path)
+    
+    def _makedirs(self, path):
+        """ディレクトリがなければ作成する（作成した場合はTrue）"""
+        if self.dir_cache:
+            return self.dir_cache.makedirs(path)
+        if os.path.exists(path):
+            return False
+        os.makedirs(path)
+        return True
     
     def create_symlink(self, source_path, output_dir, subdir_name="book_covers"):
         """シンボリックリンクを作成する"""
@@ -20,8 +43,7 @@ class SymbolicLinkCreator:
             subdir_path = os.path.join(output_dir, subdir_name)
             
             # サブディレクトリが存在しない場合は作成
-            if not os.path.exists(subdir_path):
-                os.makedirs(subdir_path)
+            if self._makedirs(subdir_path):
                 if self.logger:
                     self.logger.log(f"PDFリンク用サブディレクトリを作成しました: {subdir_path}")
             
@@ -29,9 +51,11 @@ class SymbolicLinkCreator:
             output_path = os.path.join(subdir_path, filename_no_spaces)
             
             # すでに存在する場合は削除
-            if os.path.exists(output_path):
-                if os.path.islink(output_path):
+            if self._exists(output_path):
+                if self._islink(output_path):
                     os.unlink(output_path)
+                    if self.dir_cache:
+                        self.dir_cache.discard(output_path)
                     if self.logger:
                         self.logger.log(f"既存のシンボリックリンクを削除しました: {output_path}")
                 else:
@@ -41,7 +65,9 @@ class SymbolicLinkCreator:
             
             # シンボリックリンクを作成
             os.symlink(source_path, output_path)
-            self.created_links.append(output_path)
+            if self.dir_cache:
+                self.dir_cache.add(output_path, is_symlink=True, target=source_path)
+            self.created_links.append((output_path, source_path))
             
             if self.logger:
                 self.logger.log(f"シンボリックリンクを作成しました: {output_path} -> {source_path}")
@@ -53,7 +79,7 @@ class SymbolicLinkCreator:
             return None
     
     def get_created_links(self):
-        """作成されたシンボリックリンクのリストを返す"""
+        """作成されたシンボリックリンクの (リンクのパス, リンク先) のリストを返す"""
         return self.created_links
     
     def clear_created_links(self):